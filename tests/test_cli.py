@@ -1,22 +1,27 @@
 """Tests for wherewasi CLI."""
 
+import contextlib
+import io
 import json
+import os
 import tempfile
+from datetime import UTC, datetime
 from pathlib import Path
 from unittest.mock import patch
 
-from wherewasi.cli import _build_table, _format_date, _parse_datetime, _scan_projects
-
-
-def test_parse_datetime():
-    dt = _parse_datetime("2026-01-19T01:51:54.536Z")
-    assert dt.year == 2026
-    assert dt.month == 1
-    assert dt.day == 19
+from wherewasi.cli import (
+    Project,
+    Session,
+    _build_table,
+    _format_date,
+    _format_markdown,
+    _scan_projects,
+    main,
+)
 
 
 def test_format_date():
-    dt = _parse_datetime("2026-01-19T01:51:54.536Z")
+    dt = datetime(2026, 1, 19, 1, 51, 54, tzinfo=UTC)
     result = _format_date(dt)
     assert "Jan" in result
     assert "19" in result
@@ -35,6 +40,34 @@ def test_build_table_empty():
     assert table.row_count == 0
 
 
+def test_format_markdown():
+    modified = datetime(2026, 1, 5, 1, tzinfo=UTC)
+    session = Session(summary="", first_prompt="hello world", modified=modified)
+    project = Project(
+        name="demo",
+        path="/tmp/demo",
+        description="A demo project",
+        last_active=modified,
+        sessions=[session],
+    )
+    text = _format_markdown([project]).decode()
+    assert text.startswith("# Where Was I?\n")
+    assert "## demo" in text
+    assert "**Last Active:** Jan  5 | **Directory:** `/tmp/demo`" in text
+    assert "*A demo project*" in text
+    assert "- **Jan  5** — (no summary)" in text
+    assert text.endswith('  > "hello world"\n\n')
+
+
+def test_main_markdown_without_stdout_buffer():
+    out = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch("wherewasi.cli.CLAUDE_PROJECTS_DIR", Path(tmpdir)):
+            with contextlib.redirect_stdout(out):
+                main(["--markdown"])
+    assert out.getvalue() == "# Where Was I?\n\n"
+
+
 def test_scan_with_mock_data():
     with tempfile.TemporaryDirectory() as tmpdir:
         project_dir = Path(tmpdir) / "test-project"
@@ -65,3 +98,124 @@ def test_scan_with_mock_data():
         assert projects[0].name == "test-project"
         assert len(projects[0].sessions) == 1
         assert projects[0].sessions[0].first_prompt == "hello world"
+
+
+def test_scan_skips_unreadable_project_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ["locked", "x"]:
+            project_dir = Path(tmpdir) / name
+            project_dir.mkdir()
+            rec = {
+                "type": "user",
+                "message": {"role": "user", "content": name},
+                "cwd": f"/tmp/{name}",
+                "timestamp": "2026-01-19T01:00:00Z",
+            }
+            (project_dir / "abc123.jsonl").write_text(json.dumps(rec))
+
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if str(path).endswith("locked"):
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        with (
+            patch("wherewasi.cli.CLAUDE_PROJECTS_DIR", Path(tmpdir)),
+            patch("wherewasi.cli.os.scandir", scandir),
+        ):
+            projects = _scan_projects()
+
+        assert [p.name for p in projects] == ["x"]
+
+
+def test_scan_truncates_long_prompt():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir) / "test-project"
+        project_dir.mkdir()
+        rec = {
+            "type": "user",
+            "message": {"role": "user", "content": "x" * 100},
+            "cwd": "/tmp/test-project",
+            "timestamp": "2026-01-19T01:00:00Z",
+        }
+        (project_dir / "abc123.jsonl").write_text(json.dumps(rec))
+
+        with patch("wherewasi.cli.CLAUDE_PROJECTS_DIR", Path(tmpdir)):
+            projects = _scan_projects()
+
+        assert projects[0].sessions[0].first_prompt == "x" * 67 + "..."
+
+
+def test_scan_projects_limit():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i, name in enumerate(["old", "new"]):
+            project_dir = Path(tmpdir) / name
+            project_dir.mkdir()
+            rec = {
+                "type": "user",
+                "message": {"role": "user", "content": name},
+                "cwd": f"/tmp/{name}",
+                "timestamp": "2026-01-19T01:00:00Z",
+            }
+            jsonl_file = project_dir / "abc123.jsonl"
+            jsonl_file.write_text(json.dumps(rec))
+            os.utime(jsonl_file, (1_700_000_000 + i, 1_700_000_000 + i))
+
+        with patch("wherewasi.cli.CLAUDE_PROJECTS_DIR", Path(tmpdir)):
+            assert [p.name for p in _scan_projects()] == ["new", "old"]
+            assert [p.name for p in _scan_projects(1)] == ["new"]
+
+
+def test_scan_last_active_is_newest_session():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for name, sid in [("a", "s1"), ("a", "s2"), ("b", "s3")]:
+            project_dir = Path(tmpdir) / name
+            project_dir.mkdir(exist_ok=True)
+            rec = {
+                "type": "user",
+                "message": {"role": "user", "content": sid},
+                "cwd": f"/tmp/{name}",
+                "timestamp": "2026-01-19T01:00:00Z",
+            }
+            jsonl_file = project_dir / f"{sid}.jsonl"
+            jsonl_file.write_text(json.dumps(rec))
+            files.append(jsonl_file)
+        os.utime(files[2], (1_700_000_100, 1_700_000_100))
+
+        # Swap which of project a's sessions is newest, so that in one pass the
+        # newer file is not the first one read, whatever the directory order.
+        for older, newer in [(files[0], files[1]), (files[1], files[0])]:
+            os.utime(older, (1_700_000_000, 1_700_000_000))
+            os.utime(newer, (1_700_000_200, 1_700_000_200))
+
+            with patch("wherewasi.cli.CLAUDE_PROJECTS_DIR", Path(tmpdir)):
+                projects = _scan_projects()
+                limited = _scan_projects(1)
+
+            newest = datetime.fromtimestamp(1_700_000_200, tz=UTC)
+            assert [p.name for p in projects] == ["a", "b"]
+            assert projects[0].last_active == newest
+            assert [p.name for p in limited] == ["a"]
+            assert limited[0].last_active == newest
+
+
+def test_scan_keeps_session_with_bad_utf8():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir) / "test-project"
+        project_dir.mkdir()
+        rec = {
+            "type": "user",
+            "message": {"role": "user", "content": "caf@ bad utf8 \ud83d"},
+            "cwd": "/tmp/test-project",
+            "timestamp": "2026-01-19T01:00:00Z",
+        }
+        line = json.dumps(rec).encode().replace(b"@", b"\xe9")
+        (project_dir / "abc123.jsonl").write_bytes(line + b"\n")
+
+        with patch("wherewasi.cli.CLAUDE_PROJECTS_DIR", Path(tmpdir)):
+            projects = _scan_projects()
+
+        assert len(projects) == 1
+        assert projects[0].sessions[0].first_prompt == "caf\ufffd bad utf8 \ud83d"
@@ -1,62 +1,83 @@
 """Where Was I - Claude Code session reporter."""
 
+import functools
+import heapq
+import itertools
 import json
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 
+import orjson
 from libcli import BaseCLI
-from rich import box
 from rich.console import Console
 from rich.table import Table
 
 __all__ = ["WhereWasICLI"]
 
 CLAUDE_PROJECTS_DIR = Path("~/.claude/projects").expanduser()
-
-
-@dataclass
+_DESCRIPTION_MAX_LINES = 200
+_HOME_STR = str(Path.home())
+_HOME_LEN = len(_HOME_STR)
+_MD_HEADER = b"# Where Was I?\n\n"
+_MD_SESSIONS_HDR = b"### Sessions\n\n"
+_MONTHS = (
+    "",
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+
+
+@dataclass(slots=True)
 class Session:
     """A single Claude Code session entry."""
 
     summary: str
     first_prompt: str
     modified: datetime
-    created: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     """A Claude Code project with its sessions."""
 
     name: str
     path: str
     description: str
+    last_active: datetime
     sessions: list[Session] = field(default_factory=list)
 
-    @property
-    def last_active(self) -> datetime:
-        """Return the most recent session modification time."""
-        return max(s.modified for s in self.sessions)
-
-
-def _parse_datetime(s: str) -> datetime:
-    """Parse an ISO format datetime string."""
-    return datetime.fromisoformat(s.replace("Z", "+00:00"))
-
 
 def _short_path(path: str) -> str:
     """Shorten a path by replacing the home directory with ~."""
-    home = str(Path.home())
-    if path.startswith(home):
-        return "~" + path[len(home) :]
+    if path.startswith(_HOME_STR):
+        return "~" + path[_HOME_LEN:]
     return path
 
 
+@functools.lru_cache(maxsize=1024)
+def _format_month_day(month: int, day: int) -> str:
+    """Format a month and day as 'Mon DD'."""
+    return f"{_MONTHS[month]} {day:>2}"
+
+
 def _format_date(dt: datetime) -> str:
     """Format a datetime as 'Mon DD'."""
-    return dt.strftime("%b %d").replace(" 0", "  ")
+    return _format_month_day(dt.month, dt.day)
 
 
 def _read_project_description(project_path: str) -> str:
@@ -65,44 +86,45 @@ def _read_project_description(project_path: str) -> str:
     claude_md = Path(project_path) / "CLAUDE.md"
     if not claude_md.exists():
         return ""
-    for line in claude_md.read_text(errors="replace").splitlines():
-        line = line.strip()
-        # Skip empty lines, the heading, and the boilerplate
-        if not line:
-            continue
-        if line.startswith("# "):
-            continue
-        if line.startswith("This file provides guidance"):
-            continue
-        if line.startswith("## "):
-            # Return section name content as description
-            return line[3:].strip()
-        return line
+    with claude_md.open(errors="replace") as f:
+        for line in itertools.islice(f, _DESCRIPTION_MAX_LINES):
+            line = line.strip()
+            # Skip empty lines, the heading, and the boilerplate
+            if not line:
+                continue
+            if line.startswith("# "):
+                continue
+            if line.startswith("This file provides guidance"):
+                continue
+            if line.startswith("## "):
+                # Return section name content as description
+                return line[3:].strip()
+            return line
     return ""
 
 
-def _read_jsonl_session(path: Path) -> tuple[str, Session] | None:
+def _read_jsonl_session(path: Path, mtime: float) -> tuple[str, Session] | None:
     """Read session metadata from a .jsonl file. Returns (cwd, Session) or None."""
 
     summary = ""
     first_prompt = ""
     cwd = ""
-    first_ts: str | None = None
+    has_ts = False
 
     try:
-        mtime = datetime.fromtimestamp(path.stat().st_mtime, tz=UTC)
-
-        # Read head for summary, first prompt, cwd, and first timestamp.
-        with path.open(errors="replace") as f:
+        # Read head for summary, first prompt, cwd, and whether it has a timestamp.
+        with path.open("rb") as f:
             for line in f:
                 try:
-                    rec = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if first_ts is None:
-                    ts = rec.get("timestamp")
-                    if ts:
-                        first_ts = ts
+                    rec = orjson.loads(line)
+                except ValueError:
+                    # Invalid UTF-8 or a lone surrogate escape; parse leniently.
+                    try:
+                        rec = json.loads(line.decode(errors="replace"))
+                    except ValueError:
+                        continue
+                if not has_ts:
+                    has_ts = bool(rec.get("timestamp"))
                 if rec.get("type") == "summary":
                     summary = rec.get("summary", "")
                 if rec.get("type") == "user" and not first_prompt:
@@ -110,54 +132,90 @@ def _read_jsonl_session(path: Path) -> tuple[str, Session] | None:
                     if isinstance(content, str):
                         prompt = re.sub(r"<[^>]+>", "", content)
                         first_prompt = " ".join(prompt.split())
+                        if len(first_prompt) > 70:
+                            first_prompt = first_prompt[:67] + "..."
                     if not cwd:
                         cwd = rec.get("cwd", "")
-                if first_ts and first_prompt and summary:
+                if has_ts and first_prompt and summary:
                     break
     except OSError:
         return None
 
-    if first_ts is None:
+    if not has_ts:
         return None
 
     return cwd, Session(
         summary=summary,
         first_prompt=first_prompt,
-        modified=mtime,
-        created=_parse_datetime(first_ts),
+        modified=datetime.fromtimestamp(mtime, tz=UTC),
     )
 
 
-def _scan_projects() -> list[Project]:
-    """Scan ~/.claude/projects for session data."""
+def _read_jsonl_entry(entry: os.DirEntry[str]) -> tuple[str, Session] | None:
+    """Read session metadata for a .jsonl file found by the directory walk."""
+
+    # On POSIX this is a real stat() call; it runs here, in the worker thread.
+    try:
+        mtime = entry.stat().st_mtime
+    except OSError:
+        return None
+    return _read_jsonl_session(Path(entry.path), mtime)
+
+
+def _scan_projects(limit: int = 0) -> list[Project]:
+    """Scan ~/.claude/projects for session data.
+
+    Args:
+        limit: Return only the `limit` most recently active projects (0 for all).
+    """
 
     projects: dict[str, Project] = {}
 
     if not CLAUDE_PROJECTS_DIR.exists():
         return []
 
-    for project_dir in CLAUDE_PROJECTS_DIR.iterdir():
-        if not project_dir.is_dir():
-            continue
+    jsonl_files: list[os.DirEntry[str]] = []
+    with os.scandir(CLAUDE_PROJECTS_DIR) as project_dirs:
+        for project_dir in project_dirs:
+            if not project_dir.is_dir():
+                continue
+            try:
+                with os.scandir(project_dir.path) as entries:
+                    jsonl_files.extend(
+                        entry for entry in entries if entry.name.endswith(".jsonl")
+                    )
+            except OSError:
+                # Unreadable, or removed mid-scan; skip it like glob() did.
+                continue
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
 
-        for jsonl_file in project_dir.glob("*.jsonl"):
-            result = _read_jsonl_session(jsonl_file)
+    # Reading is I/O bound; fan out the reads, but build `projects` here.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for result in executor.map(_read_jsonl_entry, jsonl_files):
             if not result:
                 continue
             cwd, session = result
 
-            if cwd not in projects:
-                projects[cwd] = Project(
+            project = projects.get(cwd)
+            if project is None:
+                project = projects[cwd] = Project(
                     name=Path(cwd).name or cwd,
                     path=cwd,
                     description=_read_project_description(cwd),
+                    last_active=session.modified,
                     sessions=[],
                 )
-            projects[cwd].sessions.append(session)
+            elif session.modified > project.last_active:
+                project.last_active = session.modified
+            project.sessions.append(session)
 
     for project in projects.values():
         project.sessions.sort(key=lambda s: s.modified, reverse=True)
 
+    if limit > 0:
+        return heapq.nlargest(limit, projects.values(), key=lambda p: p.last_active)
+
     sorted_projects = list(projects.values())
     sorted_projects.sort(key=lambda p: p.last_active, reverse=True)
     return sorted_projects
@@ -173,67 +231,60 @@ def _build_table(projects: list[Project]) -> Table:
     for i, project in enumerate(projects):
         short = _short_path(project.path)
 
-        sub = Table(
-            show_header=False,
-            show_edge=False,
-            box=box.HORIZONTALS,
-            show_lines=True,
-            pad_edge=False,
-            expand=True,
-        )
-        sub.add_column(ratio=1)
+        cells: list[str] = []
         for session in project.sessions:
             sdate = _format_date(session.modified)
             summary = session.summary or "(no summary)"
             cell = f"{sdate}  {summary}"
             if session.first_prompt:
-                prompt = session.first_prompt
-                if len(prompt) > 70:
-                    prompt = prompt[:67] + "..."
-                cell += f'\n  "{prompt}"'
-            sub.add_row(cell)
+                cell += f'\n  "{session.first_prompt}"'
+            cells.append(cell)
 
-        table.add_row(short, sub)
+        table.add_row(short, "\n".join(cells))
         if i < len(projects) - 1:
             table.add_section()
 
     return table
 
 
-def _format_markdown(projects: list[Project]) -> str:
-    """Format projects as Markdown."""
+def _format_markdown(projects: list[Project]) -> bytes:
+    """Format projects as UTF-8 encoded Markdown."""
 
-    lines: list[str] = []
-    lines.append("# Where Was I?")
-    lines.append("")
+    parts: list[bytes] = [_MD_HEADER]
 
     for project in projects:
         short = _short_path(project.path)
         date = _format_date(project.last_active)
-        lines.append(f"## {project.name}")
-        lines.append("")
-        lines.append(f"**Last Active:** {date} | **Directory:** `{short}`")
-        lines.append("")
+        parts.append(
+            f"## {project.name}\n\n**Last Active:** {date} | **Directory:** `{short}`\n\n".encode()
+        )
 
         if project.description:
-            lines.append(f"*{project.description}*")
-            lines.append("")
+            parts.append(f"*{project.description}*\n\n".encode())
 
-        lines.append("### Sessions")
-        lines.append("")
+        parts.append(_MD_SESSIONS_HDR)
         for session in project.sessions:
             sdate = _format_date(session.modified)
             summary = session.summary or "(no summary)"
-            lines.append(f"- **{sdate}** — {summary}")
+            parts.append(f"- **{sdate}** — {summary}\n".encode())
             if session.first_prompt:
-                prompt = session.first_prompt
-                if len(prompt) > 70:
-                    prompt = prompt[:67] + "..."
-                lines.append(f'  > "{prompt}"')
+                parts.append(f'  > "{session.first_prompt}"\n'.encode())
+
+        parts.append(b"\n")
 
-        lines.append("")
+    return b"".join(parts)
 
-    return "\n".join(lines)
+
+def _write_stdout(data: bytes) -> None:
+    """Write encoded output to stdout, bypassing the text layer when possible."""
+
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # e.g. contextlib.redirect_stdout(io.StringIO())
+        sys.stdout.write(data.decode())
+        return
+    sys.stdout.flush()
+    buffer.write(data)
 
 
 class WhereWasICLI(BaseCLI):
@@ -273,13 +324,10 @@ class WhereWasICLI(BaseCLI):
     def main(self) -> None:
         """Command line interface entry point (method)."""
 
-        projects = _scan_projects()
-
-        if self.options.n > 0:
-            projects = projects[: self.options.n]
+        projects = _scan_projects(self.options.n)
 
         if self.options.markdown:
-            print(_format_markdown(projects))
+            _write_stdout(_format_markdown(projects))
         else:
             Console().print(_build_table(projects))
 